@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Scripts import corebuddy relative to MyProject/, so make it importable in tests
+sys.path.insert(0, os.path.dirname(__file__))
@@ -0,0 +1,176 @@
+import os
+import time
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+
+
+def current_cgroup():
+    # cgroup v2 has a single "0::/path" line in /proc/self/cgroup
+    try:
+        with open("/proc/self/cgroup") as f:
+            for line in f:
+                if line.startswith("0::"):
+                    return line[3:].strip() or "/"
+    except OSError:
+        pass
+    return "/"
+
+
+def is_cgroup2(root=CGROUP_ROOT):
+    return os.path.exists(os.path.join(root, "cgroup.controllers"))
+
+
+def parse_cpu_max(text):
+    # "max 100000" means unlimited, "200000 100000" means 2 CPUs
+    quota, _, period = text.strip().partition(" ")
+    if quota == "max" or not period:
+        return None
+    return int(quota) / int(period)
+
+
+def host_memory():
+    # MemTotal, first line of /proc/meminfo, in bytes
+    with open("/proc/meminfo") as f:
+        return int(f.readline().split()[1]) * 1024
+
+
+def parse_flat_keyed(text):
+    stats = {}
+    for line in text.splitlines():
+        key, _, value = line.partition(" ")
+        if value:
+            stats[key] = int(value)
+    return stats
+
+
+class CgroupReader:
+    def __init__(self, path=None, root=CGROUP_ROOT):
+        self.root = root
+        self.path = path or current_cgroup()
+        if not os.path.isdir(self.full_path(self.path)):
+            raise ValueError(f"cgroup {self.path} not found under {root}")
+        self.dir_fds = {}
+        self.last_usage = {}
+        self.allowances = {}
+        self.host_cpus = os.cpu_count() or 1
+        self.host_memory = None
+
+    def close(self):
+        for fd in self.dir_fds.values():
+            os.close(fd)
+        self.dir_fds.clear()
+
+    def full_path(self, path):
+        return os.path.join(self.root, path.lstrip("/"))
+
+    def drop(self, path):
+        fd = self.dir_fds.pop(path, None)
+        if fd is not None:
+            os.close(fd)
+        self.last_usage.pop(path, None)
+
+    def dir_alive(self, path, fd):
+        # A removed cgroup's fd stays valid, so compare it with what the path now names
+        try:
+            return os.stat(self.full_path(path)).st_ino == os.fstat(fd).st_ino
+        except OSError:
+            return False
+
+    def dir_fd(self, path):
+        fd = self.dir_fds.get(path)
+        if fd is None:
+            fd = os.open(self.full_path(path), os.O_RDONLY | os.O_DIRECTORY)
+            self.dir_fds[path] = fd
+        return fd
+
+    def read(self, path, name):
+        dfd = self.dir_fd(path)
+        try:
+            fd = os.open(name, os.O_RDONLY, dir_fd=dfd)
+        except FileNotFoundError:
+            # Only forget the handle if the cgroup itself was removed; a file
+            # can also be missing because its controller is not enabled
+            if not self.dir_alive(path, dfd):
+                self.drop(path)
+            raise
+        try:
+            return os.read(fd, 65536).decode()
+        finally:
+            os.close(fd)
+
+    def read_int(self, path, name):
+        value = self.read(path, name).strip()
+        return None if value == "max" else int(value)
+
+    def cpu_limit(self, path=None):
+        try:
+            return parse_cpu_max(self.read(path or self.path, "cpu.max"))
+        except FileNotFoundError:
+            # the root cgroup has no cpu.max
+            return None
+
+    def cpu_allowance(self, path=None):
+        # CPUs the cgroup may actually use: its quota, but never more than the host has
+        limit = self.cpu_limit(path)
+        if limit is None:
+            return self.host_cpus
+        return min(limit, self.host_cpus)
+
+    def cpu_percent(self, path=None):
+        # percentage of the cgroup's CPU allowance used since the last call
+        path = path or self.path
+        usage = parse_flat_keyed(self.read(path, "cpu.stat"))["usage_usec"]
+        now = time.monotonic()
+        last = self.last_usage.get(path)
+        self.last_usage[path] = (usage, now)
+        allowance = self.allowances[path] = self.cpu_allowance(path)
+        if last is None or now <= last[1]:
+            return 0.0
+        used = (usage - last[0]) / ((now - last[1]) * 1e6)
+        return min(100.0, max(0.0, used / allowance * 100))
+
+    def memory(self, path=None):
+        path = path or self.path
+        current = self.read_int(path, "memory.current")
+        try:
+            limit = self.read_int(path, "memory.max")
+        except FileNotFoundError:
+            limit = None
+        stat = parse_flat_keyed(self.read(path, "memory.stat"))
+        if limit is None:
+            # unlimited cgroups are bounded by host memory, read once
+            if self.host_memory is None:
+                self.host_memory = host_memory()
+            limit = self.host_memory
+        percent = current / limit * 100 if limit else 0.0
+        return {
+            "current": current,
+            "max": limit,
+            "percent": percent,
+            "anon": stat.get("anon", 0),
+            "file": stat.get("file", 0),
+        }
+
+    def children(self, path=None):
+        path = path or self.path
+        with os.scandir(self.dir_fd(path)) as entries:
+            names = [e.name for e in entries if e.is_dir(follow_symlinks=False)]
+        children = [path.rstrip("/") + "/" + name for name in sorted(names)]
+
+        # Close handles of children that have been removed since the last scan
+        prefix = path.rstrip("/") + "/"
+        listed = set(children)
+        for cached in list(self.dir_fds):
+            if cached.startswith(prefix) and "/" not in cached[len(prefix):] and cached not in listed:
+                self.drop(cached)
+        return children
+
+    def child_usage(self, path=None):
+        usage = []
+        for child in self.children(path):
+            try:
+                usage.append((child, self.cpu_percent(child), self.memory(child)))
+            except (FileNotFoundError, KeyError):
+                # child vanished or has the controllers disabled
+                continue
+        return usage
@@ -0,0 +1,110 @@
+import math
+import os
+import re
+
+import psutil
+
+CPU_ROOT = "/sys/devices/system/cpu"
+
+
+def open_or_none(path):
+    try:
+        return os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+
+
+def read_int(fd):
+    # sysfs attributes are regenerated on every read from offset 0,
+    # so a cached fd can be re-read with pread instead of reopened
+    try:
+        return int(os.pread(fd, 32, 0))
+    except (OSError, ValueError):
+        return None
+
+
+def parse_cpu_list(text):
+    # "0-3,5,7-8" -> [0, 1, 2, 3, 5, 7, 8]
+    cpus = []
+    for part in text.strip().split(","):
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        cpus.extend(range(int(first), int(last or first) + 1))
+    return cpus
+
+
+def online_cpus(root):
+    # psutil only reports online CPUs, so offline ones must not take an index
+    try:
+        with open(os.path.join(root, "online")) as f:
+            return parse_cpu_list(f.read())
+    except (OSError, ValueError):
+        pass
+    cpus = []
+    for name in os.listdir(root):
+        if not re.fullmatch(r"cpu\d+", name):
+            continue
+        try:
+            with open(os.path.join(root, name, "online")) as f:
+                if f.read().strip() == "0":
+                    continue
+        except OSError:
+            pass  # cpu0 often has no online file and is always online
+        cpus.append(int(name[3:]))
+    return sorted(cpus)
+
+
+class CpuFreqReader:
+    def __init__(self, root=CPU_ROOT):
+        self.cpus = online_cpus(root)
+
+        self.freq_fds = []
+        self.throttle_fds = []
+        self.max_freq = []
+        for cpu in self.cpus:
+            base = os.path.join(root, f"cpu{cpu}")
+            self.freq_fds.append(open_or_none(os.path.join(base, "cpufreq", "scaling_cur_freq")))
+            self.throttle_fds.append(open_or_none(os.path.join(base, "thermal_throttle", "core_throttle_count")))
+            fd = open_or_none(os.path.join(base, "cpufreq", "cpuinfo_max_freq"))
+            max_freq = read_int(fd) if fd is not None else None
+            self.max_freq.append(max_freq / 1000 if max_freq else 0.0)
+            if fd is not None:
+                os.close(fd)
+
+        # Without cpufreq in sysfs (VMs, containers, non-Linux) fall back to psutil
+        self.use_sysfs = any(fd is not None for fd in self.freq_fds)
+        if not self.use_sysfs:
+            freqs = psutil.cpu_freq(percpu=True) or []
+            self.max_freq = [f.max for f in freqs] or self.max_freq
+        self.has_throttle = any(fd is not None for fd in self.throttle_fds)
+        self.throttle_last = [0] * len(self.cpus)
+
+    def close(self):
+        for fd in self.freq_fds + self.throttle_fds:
+            if fd is not None:
+                os.close(fd)
+        self.freq_fds = []
+        self.throttle_fds = []
+
+    def frequencies(self):
+        # current frequency of every core in MHz
+        if self.use_sysfs:
+            freqs = []
+            for fd in self.freq_fds:
+                value = read_int(fd) if fd is not None else None
+                freqs.append(value / 1000 if value is not None else math.nan)
+            return freqs
+        freqs = psutil.cpu_freq(percpu=True) or []
+        return [f.current for f in freqs]
+
+    def throttle_counts(self):
+        # cumulative thermal throttle events per core, 0 where unsupported;
+        # a failed read repeats the last good value so it can't fake a burst
+        counts = self.throttle_last
+        for i, fd in enumerate(self.throttle_fds):
+            if fd is not None:
+                value = read_int(fd)
+                if value is not None:
+                    counts[i] = value
+        return list(counts)
@@ -0,0 +1,107 @@
+import math
+import warnings
+
+import numpy as np
+
+
+class MinMaxLod:
+    # Level-of-detail buffer for a sliding window of `length` samples drawn
+    # into roughly `width` pixels. Samples are folded into fixed-size buckets
+    # that keep their min and max, so drawing costs O(width) no matter how
+    # long the history is, and each new sample only touches the tail bucket.
+    def __init__(self, length, width):
+        self.length = length
+        self.reset(width)
+
+    def bucket_for(self, width):
+        return max(1, math.ceil(self.length / max(1, int(width))))
+
+    def reset(self, width, samples=()):
+        self.bucket = self.bucket_for(width)
+        self.buckets = math.ceil(self.length / self.bucket)
+        n = self.buckets
+        # Interleaved min/max pairs, written twice so the window is one slice
+        self.y = np.full(4 * n, np.nan)
+        self.x = np.repeat(np.arange(1 - n, 1, dtype=np.float64) * self.bucket, 2)
+        self.pos = n - 1
+        self.fill = self.bucket
+        self.load(np.asarray(samples, dtype=np.float64))
+
+    def load(self, samples):
+        # Bucket the whole history at once; the front is padded with NaN so
+        # the newest bucket ends on the newest sample and appends continue it
+        if not len(samples):
+            return
+        rows = math.ceil(len(samples) / self.bucket)
+        padded = np.full(rows * self.bucket, np.nan)
+        padded[len(padded) - len(samples):] = samples
+        padded = padded.reshape(rows, self.bucket)[-self.buckets:]
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN buckets
+            mins = np.nanmin(padded, axis=1)
+            maxs = np.nanmax(padded, axis=1)
+        k = len(padded)
+        n = self.buckets
+        for half in (0, 2 * n):
+            self.y[half:half + 2 * k:2] = mins
+            self.y[half + 1:half + 2 * k:2] = maxs
+        self.pos = k - 1
+        self.fill = self.bucket
+
+    def append(self, value):
+        if self.fill == self.bucket:
+            self.pos = (self.pos + 1) % self.buckets
+            self.fill = 0
+        i = 2 * self.pos
+        j = i + 2 * self.buckets
+        y = self.y
+        if self.fill == 0:
+            y[i] = y[i + 1] = y[j] = y[j + 1] = value
+        elif value == value:
+            # NaN samples (missing readings) never widen the bucket
+            if not y[i] <= value:
+                y[i] = y[j] = value
+            if not y[i + 1] >= value:
+                y[i + 1] = y[j + 1] = value
+        self.fill += 1
+
+    def view(self):
+        start = 2 * (self.pos + 1)
+        y = self.y[start:start + 2 * self.buckets]
+        if self.bucket == 1:
+            return self.x[::2], y[::2]
+        return self.x, y
+
+
+class LodCurve:
+    # Keeps a plot curve fed from a MinMaxLod instead of the full history.
+    # `source` returns the raw history and is only used to rebuild the
+    # buckets when the plot is resized to a different bucket size.
+    def __init__(self, curve, length, width, source):
+        self.curve = curve
+        self.source = source
+        self.lod = MinMaxLod(length, width)
+        self.lod.reset(width, source())
+        self.stale = False
+
+    def resize(self, width):
+        if self.lod.bucket_for(width) != self.lod.bucket:
+            self.lod.reset(width, self.source())
+            self.redraw()
+
+    def append(self, value, draw=True):
+        # While the plot is hidden only the buffer is updated; flush() catches up
+        self.lod.append(value)
+        if draw:
+            self.redraw()
+        else:
+            self.stale = True
+
+    def flush(self):
+        if self.stale:
+            self.redraw()
+
+    def redraw(self):
+        self.stale = False
+        x, y = self.lod.view()
+        self.curve.setData(x, y, connect="finite")
@@ -0,0 +1,139 @@
+import os
+
+import numpy as np
+
+CHUNK_ROWS = 512
+TIME_DECIMALS = 3
+VALUE_DECIMALS = 2
+# int64 holds every 18-digit number, so wider fields are formatted as text
+MAX_PLACES = 18
+
+
+def trim_columns(columns):
+    # Series start at slightly different ticks; keep the common tail
+    rows = min(len(values) for values in columns.values())
+    return {name: values[len(values) - rows:] for name, values in columns.items()}
+
+
+def column_places(values, decimals):
+    # Digits each column needs for its largest finite value, at least one
+    # before the point and three so "nan"/"inf" fit
+    finite = np.where(np.isfinite(values), np.abs(values), 0.0)
+    largest = np.rint(finite.max(axis=0) * 10.0 ** decimals)
+    places = np.maximum(len_digits(largest), np.maximum(decimals + 1, 3))
+    return places
+
+
+def len_digits(values):
+    with np.errstate(divide="ignore"):
+        digits = np.floor(np.log10(np.maximum(values, 1.0))).astype(np.int64) + 1
+    # log10 can land just under an exact power of ten
+    exact = digits <= MAX_PLACES
+    digits[exact] += values[exact] >= 10.0 ** digits[exact]
+    return digits
+
+
+def format_fixed(values, decimals, places, block, offsets):
+    # Writes a (rows, k) float block as fixed-point ASCII into the byte
+    # matrix `block`, column j taking places + 2 bytes from offsets[j]: sign,
+    # digits with the point placed per column, nan/inf/-inf for non-finite
+    # values. Unused leading bytes stay 0 and are squeezed out by the caller,
+    # so the block is formatted with array ops instead of per-value strings.
+    finite = np.isfinite(values)
+    scaled = np.rint(np.abs(np.where(finite, values, 0.0)) * 10.0 ** decimals).astype(np.int64)
+    negative = (values < 0) & ((scaled > 0) | ~finite)
+
+    # Peel digits off with a scalar divmod; uint32 is much faster when it fits.
+    # A digit is a leading zero when nothing is left to its left, except the
+    # one right before the decimal point.
+    dtype = np.uint32 if places <= 9 else np.int64
+    remaining = scaled.astype(dtype)
+    digits = np.empty(values.shape + (places,), dtype=np.uint8)
+    for place in range(places - 1, -1, -1):
+        may_blank = place < places - decimals - 1
+        blank = (remaining == 0) & may_blank if may_blank.any() else None
+        remaining, digit = np.divmod(remaining, dtype(10))
+        digit = digit.astype(np.uint8) + ord("0")
+        if blank is not None:
+            digit[blank] = 0
+        digits[..., place] = digit
+    digits[~finite] = 0
+
+    order = np.arange(places)
+    whole = places - decimals
+    index = offsets[:, None] + 1 + order + (order >= whole[:, None])
+    block[:, index.ravel()] = digits.reshape(len(values), -1)
+    block[:, offsets] = np.where(negative, ord("-"), 0)
+    block[:, offsets + 1 + whole] = np.where(finite, ord("."), 0)
+
+    rows, columns = np.nonzero(~finite)
+    if len(rows):
+        words = np.where(np.isnan(values[rows, columns]), "nan", "inf")
+        for i, letters in enumerate(zip(*words)):
+            block[rows, offsets[columns] + 1 + i] = [ord(c) for c in letters]
+
+
+def format_text(values, decimals):
+    # Fallback for values too large for format_fixed; returns (rows, width) uint8
+    # values that round to zero are written without a sign
+    tiny = 0.5 * 10.0 ** -decimals
+    text = np.array([np.format_float_positional(0.0 if abs(v) < tiny else v, precision=decimals,
+                                                unique=False, trim="k")
+                     for v in values], dtype=bytes)
+    return text.view(np.uint8).reshape(len(values), text.dtype.itemsize)
+
+
+def write_csv(path, columns, chunk_rows=CHUNK_ROWS):
+    columns = trim_columns(columns)
+    names = list(columns)
+    values = list(columns.values())
+    rows = len(values[0]) if values else 0
+    # Timestamps need sub-second precision, everything else two decimals
+    decimals = np.array([TIME_DECIMALS if name == "time" else VALUE_DECIMALS for name in names])
+    with open(path, "wb") as f:
+        f.write((",".join(names) + "\n").encode())
+        for start in range(0, rows, chunk_rows):
+            stop = min(start + chunk_rows, rows)
+            chunk = np.empty((stop - start, len(values)))
+            for i, column in enumerate(values):
+                chunk[:, i] = column[start:stop]
+
+            places = column_places(chunk, decimals)
+            text = {i: format_text(chunk[:, i], decimals[i]) for i in np.flatnonzero(places > MAX_PLACES)}
+            widths = places + 2
+            for i, field in text.items():
+                widths[i] = field.shape[1]
+            # Each field is followed by its separator in one byte matrix per chunk
+            ends = np.cumsum(widths + 1)
+            offsets = ends - widths - 1
+            block = np.zeros((stop - start, ends[-1]), dtype=np.uint8)
+
+            # Columns needing the same number of digits are formatted together
+            for width in np.unique(places[places <= MAX_PLACES]):
+                group = np.flatnonzero(places == width)
+                format_fixed(chunk[:, group], decimals[group], width, block, offsets[group])
+            for i, field in text.items():
+                block[:, offsets[i]:offsets[i] + field.shape[1]] = field
+
+            block[:, ends - 1] = ord(",")
+            block[:, -1] = ord("\n")
+            f.write(block[block != 0].tobytes())
+    return rows
+
+
+def write_columnar(path, columns):
+    # One contiguous array per column in an .npz archive; history views
+    # are written directly without being copied
+    columns = trim_columns(columns)
+    with open(path, "wb") as f:
+        np.savez(f, **{name: np.ascontiguousarray(values) for name, values in columns.items()})
+    return len(next(iter(columns.values()), ()))
+
+
+def export_history(path, columns, fmt=None):
+    # fmt is "csv" or "npz"; without one the file extension decides
+    if fmt is None:
+        fmt = "csv" if os.path.splitext(path)[1].lower() == ".csv" else "npz"
+    if fmt == "csv":
+        return write_csv(path, columns)
+    return write_columnar(path, columns)
@@ -0,0 +1,103 @@
+import math
+import subprocess
+from collections import namedtuple
+
+from corebuddy.history import RingHistory
+
+QUERY_FIELDS = [
+    "index", "name", "utilization.gpu", "memory.used", "memory.total",
+    "temperature.gpu", "power.draw", "power.limit", "clocks.sm", "clocks.mem",
+]
+
+GpuSample = namedtuple("GpuSample", [
+    "index", "name", "utilization", "memory_used", "memory_total",
+    "temperature", "power_draw", "power_limit", "clock_sm", "clock_mem",
+])
+
+# Channels kept in each device's history, in order
+HISTORY_FIELDS = ["utilization", "memory_percent", "temperature", "power_draw", "clock_sm", "clock_mem"]
+UTILIZATION, MEMORY_PERCENT, TEMPERATURE, POWER_DRAW, CLOCK_SM, CLOCK_MEM = range(len(HISTORY_FIELDS))
+
+
+def parse_number(field):
+    # nvidia-smi reports unsupported fields as "[N/A]" or "[Not Supported]"
+    try:
+        return float(field)
+    except ValueError:
+        return math.nan
+
+
+def parse_nvidia_smi(text):
+    samples = []
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        fields = [f.strip() for f in line.split(",")]
+        # GPU names may themselves contain commas; numeric fields never do
+        extra = len(fields) - len(QUERY_FIELDS)
+        if extra < 0:
+            continue
+        name = ", ".join(fields[1:2 + extra])
+        numbers = [parse_number(f) for f in fields[2 + extra:]]
+        samples.append(GpuSample(int(fields[0]), name, *numbers))
+    return samples
+
+
+def query_gpus():
+    try:
+        output = subprocess.check_output([
+            "nvidia-smi", "--query-gpu=" + ",".join(QUERY_FIELDS),
+            "--format=csv,noheader,nounits"
+        ], text=True, stderr=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError):
+        return []
+    return parse_nvidia_smi(output)
+
+
+def memory_percent(sample):
+    if not sample.memory_total:
+        return math.nan
+    return sample.memory_used / sample.memory_total * 100
+
+
+def format_value(value, unit, digits=0):
+    if math.isnan(value):
+        return "N/A"
+    return f"{value:.{digits}f}{unit}"
+
+
+def describe_fallback_gpu():
+    try:
+        output = subprocess.check_output("glxinfo | grep 'Device'", shell=True, text=True)
+        return "GPU: " + output.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "GPU: [Unavailable]"
+
+
+class GpuMonitor:
+    def __init__(self, length=60):
+        self.length = length
+        self.history = {}
+        self.samples = {}
+
+    def update(self, samples=None):
+        if samples is None:
+            samples = query_gpus()
+        for s in samples:
+            history = self.history.get(s.index)
+            if history is None:
+                history = RingHistory(len(HISTORY_FIELDS), self.length, fill=math.nan)
+                self.history[s.index] = history
+            history.append((
+                s.utilization, memory_percent(s), s.temperature,
+                s.power_draw, s.clock_sm, s.clock_mem,
+            ))
+            self.samples[s.index] = s
+
+        # Devices that stopped reporting get a gap so they stay in step with the other series
+        reported = {s.index for s in samples}
+        for index, history in self.history.items():
+            if index not in reported:
+                history.append([math.nan] * len(HISTORY_FIELDS))
+                self.samples.pop(index, None)
+        return samples
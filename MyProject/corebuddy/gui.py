@@ -1,18 +1,112 @@
 import tkinter as tk
+from collections import deque
 import psutil
 
+BASE_INTERVAL = 2000      # ms between samples while the host is busy
+MAX_INTERVAL = 8000       # ms between samples once the host has been idle for a while
+HIDDEN_INTERVAL = 10000   # ms between samples while the window is minimised or hidden
+IDLE_PERCENT = 5.0        # total CPU below this counts as idle
+
+SPARK_POINTS = 20         # samples per core sparkline
+CELL_WIDTH = 40
+CELL_HEIGHT = 14
+WIDTH = 200
+
+num_cores = psutil.cpu_count(logical=True) or 1
+columns = max(1, WIDTH // CELL_WIDTH)
+rows = -(-num_cores // columns)
+
+interval = BASE_INTERVAL
+pending = None
+was_hidden = False
+last_text = None
+spark_history = [deque([CELL_HEIGHT - 1] * SPARK_POINTS, maxlen=SPARK_POINTS) for _ in range(num_cores)]
+spark_coords = [None] * num_cores
+
+
+def is_visible():
+    return root.state() == "normal" and root.winfo_viewable()
+
+
+def update_label(cpu, ram):
+    global last_text
+    # Only build and set the text when the rounded values actually change
+    key = (round(cpu), round(ram))
+    if key == last_text:
+        return
+    last_text = key
+    label.config(text=f"CPU: {key[0]}%\nRAM: {key[1]}%")
+
+
+def update_sparklines(per_core):
+    step = (CELL_WIDTH - 4) / (SPARK_POINTS - 1)
+    for i, usage in enumerate(per_core[:num_cores]):
+        history = spark_history[i]
+        # Quantise to whole pixels so noise below a pixel never triggers a redraw
+        history.append(CELL_HEIGHT - 1 - round(usage / 100 * (CELL_HEIGHT - 2)))
+        x0 = (i % columns) * CELL_WIDTH + 2
+        y0 = (i // columns) * CELL_HEIGHT
+        coords = []
+        for n, y in enumerate(history):
+            coords.append(x0 + n * step)
+            coords.append(y0 + y)
+        if coords != spark_coords[i]:
+            spark_coords[i] = coords
+            canvas.coords(spark_lines[i], *coords)
+
+
 def update_stats():
-    cpu = psutil.cpu_percent(interval=1)
+    global interval, pending
+    # Non-blocking: each call reports usage since the previous one
+    per_core = psutil.cpu_percent(interval=None, percpu=True)
+    cpu = sum(per_core) / len(per_core)
     ram = psutil.virtual_memory().percent
-    label.config(text=f"CPU: {cpu}%\nRAM: {ram}%")
-    root.after(2000, update_stats)
+
+    if is_visible():
+        update_label(cpu, ram)
+        update_sparklines(per_core)
+        if cpu < IDLE_PERCENT:
+            interval = min(interval * 2, MAX_INTERVAL)
+        else:
+            interval = BASE_INTERVAL
+        delay = interval
+    else:
+        delay = HIDDEN_INTERVAL
+
+    pending = root.after(delay, update_stats)
+
+
+def on_unmap(event):
+    global was_hidden
+    if event.widget is root:
+        was_hidden = True
+
+
+def on_map(event):
+    global interval, pending, was_hidden
+    # Refresh straight away when the window comes back into view; the first
+    # map at startup is left alone so the primed sampler gets a real delta
+    if event.widget is root and was_hidden and pending is not None:
+        was_hidden = False
+        root.after_cancel(pending)
+        interval = BASE_INTERVAL
+        pending = root.after_idle(update_stats)
+
 
 root = tk.Tk()
 root.title("Simple System Monitor")
-root.geometry("200x100")
+root.resizable(False, False)
 
 label = tk.Label(root, text="Loading...", font=("Helvetica", 14))
-label.pack(pady=20)
+label.pack(pady=(10, 5))
+
+canvas = tk.Canvas(root, width=WIDTH, height=rows * CELL_HEIGHT, bg="black", highlightthickness=0)
+canvas.pack(padx=5, pady=(0, 10))
+spark_lines = [canvas.create_line(0, 0, 0, 0, fill="cyan") for _ in range(num_cores)]
+
+root.bind("<Map>", on_map)
+root.bind("<Unmap>", on_unmap)
 
-update_stats()
+psutil.cpu_percent(interval=None, percpu=True)  # prime the delta sampler
+pending = root.after(500, update_stats)
 root.mainloop()
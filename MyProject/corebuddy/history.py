@@ -0,0 +1,33 @@
+import numpy as np
+
+
+class RingHistory:
+    # Fixed-size history of several channels backed by one numpy array.
+    # Every sample is written twice, at pos and pos + length, so the most
+    # recent `length` samples are always one contiguous slice and reading
+    # them never copies.
+    def __init__(self, channels, length=60, fill=0.0, dtype=np.float64):
+        self.channels = channels
+        self.length = length
+        self.buf = np.full((channels, 2 * length), fill, dtype=dtype)
+        self.pos = 0
+        self.count = 0
+
+    def append(self, values):
+        self.buf[:, self.pos] = values
+        self.buf[:, self.pos + self.length] = values
+        self.pos = (self.pos + 1) % self.length
+        self.count += 1
+
+    def view(self):
+        return self.buf[:, self.pos:self.pos + self.length]
+
+    def channel(self, index):
+        return self.buf[index, self.pos:self.pos + self.length]
+
+    def latest(self):
+        return self.buf[:, self.pos + self.length - 1]
+
+    def filled(self, index):
+        # only the samples collected so far, oldest first
+        return self.channel(index)[self.length - min(self.count, self.length):]
@@ -0,0 +1,111 @@
+import pytest
+
+from corebuddy import cgroups
+from corebuddy.cgroups import CgroupReader, parse_cpu_max
+
+
+def make_cgroup(root, path, cpu_max="200000 100000", usage=1000, current=1048576, memory_max="max"):
+    directory = root / path.lstrip("/")
+    directory.mkdir(parents=True)
+    if cpu_max is not None:
+        (directory / "cpu.max").write_text(cpu_max + "\n")
+    (directory / "cpu.stat").write_text(f"usage_usec {usage}\nuser_usec 0\nsystem_usec 0\n")
+    (directory / "memory.current").write_text(f"{current}\n")
+    (directory / "memory.max").write_text(f"{memory_max}\n")
+    (directory / "memory.stat").write_text("anon 4096\nfile 8192\n")
+    return directory
+
+
+def set_usage(directory, usage):
+    (directory / "cpu.stat").write_text(f"usage_usec {usage}\n")
+
+
+def test_parse_cpu_max():
+    assert parse_cpu_max("max 100000\n") is None
+    assert parse_cpu_max("200000 100000\n") == 2.0
+    assert parse_cpu_max("50000 100000") == 0.5
+
+
+def test_missing_cgroup_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        CgroupReader("/nope", root=str(tmp_path))
+
+
+def test_cpu_allowance_keeps_fractions_and_caps_at_host(tmp_path):
+    make_cgroup(tmp_path, "/half", cpu_max="50000 100000")
+    make_cgroup(tmp_path, "/huge", cpu_max="100000000 100000")
+    make_cgroup(tmp_path, "/free", cpu_max="max 100000")
+    reader = CgroupReader("/half", root=str(tmp_path))
+    reader.host_cpus = 4
+    assert reader.cpu_allowance() == 0.5
+    assert reader.cpu_allowance("/huge") == 4
+    assert reader.cpu_allowance("/free") == 4
+
+
+def test_cpu_percent_uses_usage_deltas(tmp_path, monkeypatch):
+    directory = make_cgroup(tmp_path, "/pod", cpu_max="50000 100000")
+    clock = iter([10.0, 11.0, 13.0])
+    monkeypatch.setattr(cgroups.time, "monotonic", lambda: next(clock))
+    reader = CgroupReader("/pod", root=str(tmp_path))
+
+    assert reader.cpu_percent() == 0.0
+    # 0.25 CPU-seconds over 1 s against a 0.5 CPU allowance
+    set_usage(directory, 1000 + 250000)
+    assert reader.cpu_percent() == pytest.approx(50.0)
+    assert reader.allowances["/pod"] == 0.5
+    # 1 CPU-second over 2 s is the whole allowance
+    set_usage(directory, 1000 + 250000 + 1000000)
+    assert reader.cpu_percent() == pytest.approx(100.0)
+
+
+def test_missing_file_keeps_handle_and_deltas(tmp_path, monkeypatch):
+    directory = make_cgroup(tmp_path, "/pod", cpu_max=None)
+    clock = iter([10.0, 11.0, 12.0])
+    monkeypatch.setattr(cgroups.time, "monotonic", lambda: next(clock))
+    reader = CgroupReader("/pod", root=str(tmp_path))
+    reader.host_cpus = 1
+
+    reader.cpu_percent()
+    fd = reader.dir_fds["/pod"]
+    set_usage(directory, 1000 + 500000)
+    assert reader.cpu_percent() == pytest.approx(50.0)
+    set_usage(directory, 1000 + 1000000)
+    assert reader.cpu_percent() == pytest.approx(50.0)
+    assert reader.dir_fds["/pod"] == fd
+
+
+def test_memory_with_and_without_limit(tmp_path):
+    make_cgroup(tmp_path, "/limited", current=256, memory_max="1024")
+    make_cgroup(tmp_path, "/unlimited", current=256, memory_max="max")
+    reader = CgroupReader("/limited", root=str(tmp_path))
+    reader.host_memory = 2048
+
+    limited = reader.memory()
+    assert limited["max"] == 1024
+    assert limited["percent"] == 25.0
+    assert limited["anon"] == 4096
+    assert limited["file"] == 8192
+
+    unlimited = reader.memory("/unlimited")
+    assert unlimited["max"] == 2048
+    assert unlimited["percent"] == 12.5
+
+
+def test_children_prunes_removed_handles(tmp_path):
+    make_cgroup(tmp_path, "/node")
+    pods = [make_cgroup(tmp_path, f"/node/pod{i}") for i in range(5)]
+    reader = CgroupReader("/node", root=str(tmp_path))
+
+    assert [child for child, _, _ in reader.child_usage()] == [f"/node/pod{i}" for i in range(5)]
+    assert len(reader.dir_fds) == 6
+
+    for pod in pods[:3]:
+        for entry in pod.iterdir():
+            entry.unlink()
+        pod.rmdir()
+    assert reader.children() == ["/node/pod3", "/node/pod4"]
+    assert sorted(reader.dir_fds) == ["/node", "/node/pod3", "/node/pod4"]
+    assert not any(p in reader.last_usage for p in ("/node/pod0", "/node/pod1", "/node/pod2"))
+
+    reader.close()
+    assert reader.dir_fds == {}
@@ -0,0 +1,70 @@
+import math
+
+from corebuddy.cpufreq import CpuFreqReader, online_cpus, parse_cpu_list
+
+
+def make_cpu(root, cpu, khz=None, throttle=None, online=None):
+    base = root / f"cpu{cpu}"
+    base.mkdir()
+    if khz is not None:
+        (base / "cpufreq").mkdir()
+        (base / "cpufreq" / "scaling_cur_freq").write_text(f"{khz}\n")
+        (base / "cpufreq" / "cpuinfo_max_freq").write_text("4000000\n")
+    if throttle is not None:
+        (base / "thermal_throttle").mkdir()
+        (base / "thermal_throttle" / "core_throttle_count").write_text(f"{throttle}\n")
+    if online is not None:
+        (base / "online").write_text(f"{online}\n")
+    return base
+
+
+def test_parse_cpu_list():
+    assert parse_cpu_list("0-3,5,7-8\n") == [0, 1, 2, 3, 5, 7, 8]
+    assert parse_cpu_list("0\n") == [0]
+    assert parse_cpu_list("\n") == []
+
+
+def test_online_cpus_prefers_online_file(tmp_path):
+    for cpu in range(4):
+        make_cpu(tmp_path, cpu)
+    (tmp_path / "online").write_text("0-1,3\n")
+    assert online_cpus(str(tmp_path)) == [0, 1, 3]
+
+
+def test_online_cpus_skips_offline_directories(tmp_path):
+    make_cpu(tmp_path, 0)
+    make_cpu(tmp_path, 1, online=0)
+    make_cpu(tmp_path, 2, online=1)
+    make_cpu(tmp_path, 10, online=1)
+    (tmp_path / "cpufreq").mkdir()
+    assert online_cpus(str(tmp_path)) == [0, 2, 10]
+
+
+def test_reader_indexes_only_online_cpus(tmp_path):
+    make_cpu(tmp_path, 0, khz=1000000, throttle=5)
+    make_cpu(tmp_path, 1, khz=2000000, throttle=6, online=0)
+    make_cpu(tmp_path, 2, khz=3000000, throttle=7, online=1)
+    reader = CpuFreqReader(str(tmp_path))
+    assert reader.cpus == [0, 2]
+    assert reader.frequencies() == [1000.0, 3000.0]
+    assert reader.max_freq == [4000.0, 4000.0]
+    assert reader.throttle_counts() == [5, 7]
+    reader.close()
+
+
+def test_failed_reads(tmp_path):
+    make_cpu(tmp_path, 0, khz=1000000, throttle=5)
+    cpu1 = make_cpu(tmp_path, 1, khz=2000000, throttle=9)
+    reader = CpuFreqReader(str(tmp_path))
+    assert reader.throttle_counts() == [5, 9]
+
+    (cpu1 / "cpufreq" / "scaling_cur_freq").write_text("garbage\n")
+    (cpu1 / "thermal_throttle" / "core_throttle_count").write_text("garbage\n")
+    freqs = reader.frequencies()
+    assert freqs[0] == 1000.0 and math.isnan(freqs[1])
+    # a bad read repeats the last good count instead of dropping to 0
+    assert reader.throttle_counts() == [5, 9]
+
+    (cpu1 / "thermal_throttle" / "core_throttle_count").write_text("10\n")
+    assert reader.throttle_counts() == [5, 10]
+    reader.close()
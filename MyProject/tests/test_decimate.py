@@ -0,0 +1,41 @@
+import numpy as np
+
+from corebuddy.decimate import MinMaxLod
+
+
+def brute_force(samples, bucket, buckets):
+    padded = np.concatenate([np.full(-len(samples) % bucket, np.nan), samples])
+    rows = padded.reshape(-1, bucket)[-buckets:]
+    return np.nanmin(rows, axis=1), np.nanmax(rows, axis=1)
+
+
+def test_reset_matches_bucketed_min_max():
+    samples = np.random.default_rng(0).random(1000) * 100
+    lod = MinMaxLod(1000, 64)
+    lod.reset(64, samples)
+    mins, maxs = brute_force(samples, lod.bucket, lod.buckets)
+    _, y = lod.view()
+    assert np.allclose(y[0::2], mins)
+    assert np.allclose(y[1::2], maxs)
+
+
+def test_append_after_reset_continues_buckets():
+    samples = np.arange(90, dtype=np.float64)
+    lod = MinMaxLod(100, 10)
+    lod.reset(10, samples[:50])
+    for value in samples[50:]:
+        lod.append(value)
+    mins, maxs = brute_force(samples, lod.bucket, lod.buckets)
+    _, y = lod.view()
+    assert np.allclose(y[len(y) - 2 * len(mins):][0::2], mins)
+    assert np.allclose(y[len(y) - 2 * len(maxs):][1::2], maxs)
+    assert np.isnan(y[:len(y) - 2 * len(mins)]).all()
+
+
+def test_short_history_is_not_decimated():
+    lod = MinMaxLod(60, 640)
+    lod.reset(640, np.arange(60, dtype=np.float64))
+    x, y = lod.view()
+    assert lod.bucket == 1
+    assert list(y) == list(range(60))
+    assert x[-1] == 0
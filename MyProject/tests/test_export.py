@@ -0,0 +1,70 @@
+import csv
+import math
+
+import numpy as np
+
+from corebuddy.export import export_history, write_csv
+
+
+def test_csv_round_trip(tmp_path):
+    columns = {
+        "time": np.array([1792410639.6024, 1792410640.6024, 1792410641.6024]),
+        "cpu0_percent": np.array([0.0, -12.5, 99999.5]),
+        "temp_c": np.array([np.nan, 0.004, -np.inf]),
+    }
+    path = tmp_path / "history.csv"
+    assert write_csv(str(path), columns, chunk_rows=2) == 3
+
+    with open(path) as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["time", "cpu0_percent", "temp_c"]
+    assert rows[1] == ["1792410639.602", "0.00", "nan"]
+    assert rows[2] == ["1792410640.602", "-12.50", "0.00"]
+    assert rows[3] == ["1792410641.602", "99999.50", "-inf"]
+
+
+def test_csv_values_too_wide_for_fixed_point(tmp_path):
+    columns = {
+        "small": np.array([0.125, -3.5, np.inf]),
+        "huge": np.array([0.125, 2e17, -0.001]),
+        "widest": np.array([1e19, -np.inf, np.nan]),
+    }
+    path = tmp_path / "history.csv"
+    write_csv(str(path), columns)
+
+    with open(path) as f:
+        rows = list(csv.reader(f))
+    assert rows[1] == ["0.12", "0.12", "10000000000000000000.00"]
+    assert rows[2] == ["-3.50", "200000000000000000.00", "-inf"]
+    assert rows[3] == ["inf", "0.00", "nan"]
+
+
+def test_explicit_format_overrides_extension(tmp_path):
+    columns = {"time": np.arange(2.0)}
+    path = tmp_path / "incident"
+    export_history(str(path), columns, "csv")
+    assert path.read_text().splitlines() == ["time", "0.000", "1.000"]
+    export_history(str(path), columns, "npz")
+    assert path.read_bytes()[:2] == b"PK"
+
+
+def test_columns_are_trimmed_to_common_tail(tmp_path):
+    columns = {"time": np.arange(3.0), "gpu0_utilization": np.arange(5.0)}
+    path = tmp_path / "history.npz"
+    assert export_history(str(path), columns) == 3
+
+    with np.load(path) as data:
+        assert list(data["time"]) == [0.0, 1.0, 2.0]
+        assert list(data["gpu0_utilization"]) == [2.0, 3.0, 4.0]
+
+
+def test_csv_matches_source_values(tmp_path):
+    rng = np.random.default_rng(0)
+    columns = {f"cpu{i}_percent": np.round(rng.random(2500) * 100, 2) for i in range(8)}
+    path = tmp_path / "history.csv"
+    write_csv(str(path), columns)
+
+    values = np.loadtxt(path, delimiter=",", skiprows=1)
+    assert values.shape == (2500, 8)
+    assert np.allclose(values, np.column_stack(list(columns.values())))
+    assert not any(math.isnan(v) for v in values.ravel())
@@ -0,0 +1,62 @@
+import math
+
+from corebuddy import gpu
+
+NVIDIA_SMI = (
+    "0, NVIDIA A100-SXM4-80GB, 45, 1024, 81920, 60, 250.50, 400.00, 1410, 1593\n"
+    "1, Tesla T4, [N/A], 0, 15360, 33, [Not Supported], 70.00, 300, 405\n"
+    "2, Quadro RTX 8000, Rev. A, 99, 40000, 49152, 81, 240.10, 260.00, 1770, 6500\n"
+)
+
+
+def test_parse_multiple_devices():
+    samples = gpu.parse_nvidia_smi(NVIDIA_SMI)
+    assert [s.index for s in samples] == [0, 1, 2]
+    a100 = samples[0]
+    assert a100.name == "NVIDIA A100-SXM4-80GB"
+    assert a100.utilization == 45.0
+    assert a100.memory_used == 1024.0
+    assert a100.memory_total == 81920.0
+    assert a100.power_draw == 250.5
+    assert a100.clock_mem == 1593.0
+
+
+def test_parse_unsupported_fields_are_nan():
+    t4 = gpu.parse_nvidia_smi(NVIDIA_SMI)[1]
+    assert math.isnan(t4.utilization)
+    assert math.isnan(t4.power_draw)
+    assert t4.temperature == 33.0
+    assert gpu.format_value(t4.power_draw, "W") == "N/A"
+
+
+def test_parse_name_with_commas():
+    quadro = gpu.parse_nvidia_smi(NVIDIA_SMI)[2]
+    assert quadro.name == "Quadro RTX 8000, Rev. A"
+    assert quadro.utilization == 99.0
+    assert quadro.clock_mem == 6500.0
+
+
+def test_parse_skips_blank_and_short_lines():
+    assert gpu.parse_nvidia_smi("\n0, short, 1\n") == []
+
+
+def test_monitor_keeps_per_device_history():
+    monitor = gpu.GpuMonitor(length=4)
+    samples = gpu.parse_nvidia_smi(NVIDIA_SMI)
+    for _ in range(3):
+        monitor.update(samples)
+    assert sorted(monitor.history) == [0, 1, 2]
+    util = monitor.history[0].filled(gpu.UTILIZATION)
+    assert list(util) == [45.0, 45.0, 45.0]
+    assert monitor.history[0].latest()[gpu.MEMORY_PERCENT] == 1024 / 81920 * 100
+
+
+def test_monitor_fills_gap_for_missing_device():
+    monitor = gpu.GpuMonitor(length=4)
+    samples = gpu.parse_nvidia_smi(NVIDIA_SMI)
+    monitor.update(samples)
+    monitor.update(samples[:1])
+    assert monitor.history[1].count == 2
+    assert all(math.isnan(v) for v in monitor.history[1].latest())
+    assert 1 not in monitor.samples
+    assert monitor.history[0].latest()[gpu.UTILIZATION] == 45.0
@@ -1,4 +1,8 @@
+import os
 import sys
+import re
+import time
+import argparse
 import psutil
 import subprocess
 from collections import deque
@@ -6,15 +10,34 @@ from collections import deque
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QStackedLayout, QListWidget, QListWidgetItem, QGraphicsView,
-    QGraphicsScene, QGraphicsEllipseItem
+    QGraphicsScene, QGraphicsEllipseItem, QPushButton, QFileDialog
 )
 from PyQt5.QtCore import QTimer, Qt, QRectF
 from PyQt5.QtGui import QBrush, QColor, QPen
 import pyqtgraph as pg
 
+from corebuddy.cgroups import CgroupReader, is_cgroup2
+from corebuddy import gpu
+from corebuddy.cpufreq import CpuFreqReader
+from corebuddy.history import RingHistory
+from corebuddy.decimate import LodCurve
+from corebuddy.export import export_history
+
 class RGBDashboard(QWidget):
-    def __init__(self):
+    def __init__(self, cgroup=None, show_children=False, history=60, export_path=None):
         super().__init__()
+        # Samples kept per series; plots draw a min/max decimated view of them
+        self.history_length = history
+        self.time_history = RingHistory(1, history, fill=float("nan"))
+        self.ram_history = RingHistory(2, history)
+        self.temp_history = RingHistory(1, history, fill=float("nan"))
+        # Written when the window closes, for --export
+        self.export_path = export_path
+        # Container mode reads limits and usage from cgroup v2 instead of the host
+        if cgroup is not None and not is_cgroup2():
+            raise ValueError("cgroup mode needs a unified cgroup v2 hierarchy at /sys/fs/cgroup (v1 or hybrid host detected)")
+        self.cgroup = CgroupReader(cgroup) if cgroup is not None else None
+        self.show_children = show_children
         self.setWindowTitle("Neon RGB System Dashboard")
         self.setGeometry(200, 100, 1200, 800)
         self.setMinimumSize(800, 600)
@@ -43,7 +66,7 @@ class RGBDashboard(QWidget):
                 color: magenta;
             }
         """)
-        for item in ["Overview", "CPU", "RAM", "GPU", "Temp/Fan"]:
+        for item in ["Overview", "CPU", "RAM", "GPU", "Temp/Fan", "Export"]:
             QListWidgetItem(item, self.sidebar)
         self.sidebar.currentRowChanged.connect(self.switch_page)
         main_layout.addWidget(self.sidebar)
@@ -57,14 +80,13 @@ class RGBDashboard(QWidget):
         self.pages.addWidget(self.create_ram_page())
         self.pages.addWidget(self.create_gpu_page())
         self.pages.addWidget(self.create_temp_fan_page())
+        self.pages.addWidget(self.create_export_page())
 
         # Timer
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_all_stats)
         self.timer.start(1000)
 
-        pg.setConfigOptions(antialias=True)
-
     def neon_card(self, title):
         label = QLabel(title)
         label.setAlignment(Qt.AlignCenter)
@@ -90,15 +112,39 @@ class RGBDashboard(QWidget):
 
     def create_cpu_page(self):
         page = QWidget()
+        self.cpu_page = page
         layout = QVBoxLayout(page)
         self.cpu_label = self.neon_card("Total CPU Usage:")
         layout.addWidget(self.cpu_label)
 
         self.cpu_graphs = []
-        self.cpu_data = []
+        if self.cgroup:
+            # One graph for the whole cgroup instead of one per host core
+            self.cpu_allowance = self.cgroup.cpu_allowance()
+            self.cgroup_data = RingHistory(1, self.history_length)
+            self.cgroup_graph = self.create_cgroup_graph(layout)
+            if self.show_children:
+                self.children_label = self.neon_card("Child cgroups:")
+                layout.addWidget(self.children_label)
+            return page
+
         self.num_cores = psutil.cpu_count(logical=True)
 
+        self.freq_reader = CpuFreqReader()
+        self.freq_graphs = []
+        self.freq_titles = []
+        self.cpu_data = RingHistory(self.num_cores, self.history_length)
+        self.freq_history = RingHistory(self.num_cores, self.history_length)
+        # Per-tick throttle deltas, plus (tick, MHz, events) marks still inside the window
+        self.throttle_history = RingHistory(self.num_cores, self.history_length)
+        self.throttle_last = self.core_values(self.freq_reader.throttle_counts(), 0)
+        self.throttle_marks = [deque() for _ in range(self.num_cores)]
+        self.throttle_active = set()
+        self.throttle_markers = []
+
         for i in range(self.num_cores):
+            row = QHBoxLayout()
+
             graph = pg.PlotWidget()
             graph.setYRange(0, 100)
             graph.setBackground('#121212')
@@ -106,12 +152,49 @@ class RGBDashboard(QWidget):
             graph.getAxis('left').setPen(pg.mkPen(color='w'))
             graph.getAxis('bottom').setPen(pg.mkPen(color='w'))
             curve = graph.plot(pen=pg.mkPen(color='magenta'))
-            self.cpu_graphs.append(curve)
-            self.cpu_data.append(deque([0]*60, maxlen=60))
-            layout.addWidget(graph)
+            self.cpu_graphs.append(self.lod_curve(graph, curve, lambda i=i: self.cpu_data.channel(i)))
+            row.addWidget(graph)
+
+            # Frequency shares the usage graph's time axis
+            freq = pg.PlotWidget()
+            max_freq = self.freq_reader.max_freq[i] if i < len(self.freq_reader.max_freq) else 0
+            if max_freq:
+                freq.setYRange(0, max_freq)
+            freq.setBackground('#121212')
+            freq.setTitle(f"Core {i} MHz", color='w')
+            freq.getAxis('left').setPen(pg.mkPen(color='w'))
+            freq.getAxis('bottom').setPen(pg.mkPen(color='w'))
+            freq.setXLink(graph)
+            curve = freq.plot(pen=pg.mkPen(color='yellow'))
+            self.freq_graphs.append(self.lod_curve(freq, curve, lambda i=i: self.freq_history.channel(i)))
+            self.freq_titles.append(freq)
+            markers = pg.ScatterPlotItem(symbol='t', size=10, pen=None, brush=pg.mkBrush('orange'))
+            freq.addItem(markers)
+            self.throttle_markers.append(markers)
+            row.addWidget(freq)
+
+            layout.addLayout(row)
 
         return page
 
+    def create_cgroup_graph(self, layout):
+        graph = pg.PlotWidget()
+        graph.setYRange(0, 100)
+        graph.setBackground('#121212')
+        graph.setTitle(f"{self.cgroup.path} ({self.cpu_allowance:g} CPU limit)", color='w')
+        graph.getAxis('left').setPen(pg.mkPen(color='w'))
+        graph.getAxis('bottom').setPen(pg.mkPen(color='w'))
+        layout.addWidget(graph)
+        curve = graph.plot(pen=pg.mkPen(color='cyan'))
+        return self.lod_curve(graph, curve, lambda: self.cgroup_data.channel(0))
+
+    def lod_curve(self, graph, curve, source):
+        # Decimate to the plot's pixel width and rebucket when it is resized
+        view_box = graph.getViewBox()
+        lod = LodCurve(curve, self.history_length, view_box.width() or graph.width(), source)
+        view_box.sigResized.connect(lambda vb: lod.resize(vb.width()))
+        return lod
+
     def create_ram_page(self):
         page = QWidget()
         layout = QVBoxLayout(page)
@@ -128,16 +211,50 @@ class RGBDashboard(QWidget):
     def create_gpu_page(self):
         page = QWidget()
         layout = QVBoxLayout(page)
-        self.gpu_label = self.neon_card("GPU Info:")
-        layout.addWidget(self.gpu_label)
-
-        self.gpu_scene = QGraphicsScene()
-        self.gpu_view = QGraphicsView(self.gpu_scene)
-        self.gpu_view.setStyleSheet("background-color: #121212;")
-        layout.addWidget(self.gpu_view)
+        self.gpu_monitor = gpu.GpuMonitor(self.history_length)
+        self.gpu_cards = {}
+        self.gpu_curves = {}
+
+        samples = self.gpu_monitor.update()
+        if not samples:
+            self.gpu_label = self.neon_card(gpu.describe_fallback_gpu())
+            layout.addWidget(self.gpu_label)
+            return page
+
+        for s in samples:
+            card = self.neon_card(f"GPU {s.index}: {s.name}")
+            layout.addWidget(card)
+            self.gpu_cards[s.index] = card
+
+            load = self.create_gpu_graph(f"GPU {s.index} Load (%, C)", 0, 100)
+            power = self.create_gpu_graph(f"GPU {s.index} Power (W)", 0, s.power_limit if s.power_limit > 0 else None)
+            history = self.gpu_monitor.history[s.index]
+            curves = [
+                (gpu.UTILIZATION, load, load.plot(pen=pg.mkPen(color='cyan'), name="Util")),
+                (gpu.MEMORY_PERCENT, load, load.plot(pen=pg.mkPen(color='magenta'), name="Mem")),
+                (gpu.TEMPERATURE, load, load.plot(pen=pg.mkPen(color='orange'), name="Temp")),
+                (gpu.POWER_DRAW, power, power.plot(pen=pg.mkPen(color='yellow'))),
+            ]
+            self.gpu_curves[s.index] = [
+                (channel, self.lod_curve(graph, curve, lambda h=history, c=channel: h.channel(c)))
+                for channel, graph, curve in curves
+            ]
+            layout.addWidget(load)
+            layout.addWidget(power)
 
         return page
 
+    def create_gpu_graph(self, title, y_min, y_max):
+        graph = pg.PlotWidget()
+        if y_max is not None:
+            graph.setYRange(y_min, y_max)
+        graph.setBackground('#121212')
+        graph.setTitle(title, color='w')
+        graph.addLegend()
+        graph.getAxis('left').setPen(pg.mkPen(color='w'))
+        graph.getAxis('bottom').setPen(pg.mkPen(color='w'))
+        return graph
+
     def create_temp_fan_page(self):
         page = QWidget()
         layout = QVBoxLayout(page)
@@ -147,8 +264,72 @@ class RGBDashboard(QWidget):
         layout.addWidget(self.fan_label)
         return page
 
+    def create_export_page(self):
+        page = QWidget()
+        layout = QVBoxLayout(page)
+        self.export_label = self.neon_card("Export retained history")
+        layout.addWidget(self.export_label)
+        for text, fmt, file_filter in [("Export CSV", "csv", "CSV (*.csv)"),
+                                       ("Export Columnar (.npz)", "npz", "NumPy archive (*.npz)")]:
+            button = QPushButton(text)
+            button.setStyleSheet("color: white; font-size: 16px; padding: 10px; border: 2px solid magenta; border-radius: 10px;")
+            button.clicked.connect(lambda _, fmt=fmt, f=file_filter: self.export_dialog(fmt, f))
+            layout.addWidget(button)
+        layout.addStretch()
+        return page
+
+    def export_dialog(self, fmt, file_filter):
+        path, _ = QFileDialog.getSaveFileName(self, "Export History", "", file_filter)
+        if not path:
+            return
+        # The button decides the format; add its extension if none was typed
+        if not os.path.splitext(path)[1]:
+            path += "." + fmt
+        try:
+            rows = export_history(path, self.history_columns(), fmt)
+            self.export_label.setText(f"Exported {rows} samples to {path}")
+        except OSError as e:
+            self.export_label.setText(f"Export failed: {e}")
+
+    def history_columns(self):
+        columns = {"time": self.time_history.filled(0)}
+        if self.cgroup:
+            columns["cgroup_cpu_percent"] = self.cgroup_data.filled(0)
+        else:
+            for i in range(self.num_cores):
+                columns[f"cpu{i}_percent"] = self.cpu_data.filled(i)
+            for i in range(self.num_cores):
+                columns[f"cpu{i}_mhz"] = self.freq_history.filled(i)
+            for i in range(self.num_cores):
+                columns[f"cpu{i}_throttle_events"] = self.throttle_history.filled(i)
+        columns["ram_percent"] = self.ram_history.filled(0)
+        columns["ram_used_mb"] = self.ram_history.filled(1)
+        columns["temp_c"] = self.temp_history.filled(0)
+        for index, history in self.gpu_monitor.history.items():
+            for channel, field in enumerate(gpu.HISTORY_FIELDS):
+                columns[f"gpu{index}_{field}"] = history.filled(channel)
+        return columns
+
+    def closeEvent(self, event):
+        if self.export_path:
+            # Never let a failed export escape a Qt virtual; report it instead
+            try:
+                rows = export_history(self.export_path, self.history_columns())
+                print(f"Exported {rows} samples to {self.export_path}")
+            except OSError as e:
+                print(f"Export to {self.export_path} failed: {e}", file=sys.stderr)
+        if self.cgroup:
+            self.cgroup.close()
+        else:
+            self.freq_reader.close()
+        super().closeEvent(event)
+
     def switch_page(self, index):
         self.pages.setCurrentIndex(index)
+        if self.pages.currentWidget() is self.cpu_page and not self.cgroup:
+            # Per-core curves are not redrawn while hidden; bring them up to date
+            for lod in self.cpu_graphs + self.freq_graphs:
+                lod.flush()
 
     def draw_pie_chart(self, scene, percent_used, used_color, free_color):
         scene.clear()
@@ -171,29 +352,22 @@ class RGBDashboard(QWidget):
         scene.addItem(used_item)
 
     def update_all_stats(self):
-        # CPU
-        total = psutil.cpu_percent()
-        self.cpu_label.setText(f"Total CPU Usage: {total}%")
-
-        per_core = psutil.cpu_percent(percpu=True)
-        for i, usage in enumerate(per_core):
-            self.cpu_data[i].append(usage)
-            self.cpu_graphs[i].setData(self.cpu_data[i])
-
-        # RAM
-        ram = psutil.virtual_memory()
-        self.ram_label.setText(
-            f"RAM Usage: {ram.used // (1024**2)}MB / {ram.total // (1024**2)}MB ({ram.percent}%)"
-        )
-        self.draw_pie_chart(self.ram_scene, ram.percent, (255, 0, 255), (50, 50, 50))
+        self.time_history.append(time.time())
+        if self.cgroup:
+            self.update_cgroup_stats()
+        else:
+            self.update_host_stats()
 
         # Temp
         try:
             output = subprocess.check_output("sensors", text=True).splitlines()
             temp_line = next((line for line in output if "Package id 0" in line or "temp" in line.lower()), "Temp: ?")
             self.temp_label.setText(f"Temperature: {temp_line.strip()}")
+            match = re.search(r"([-+]?\d+(?:\.\d+)?)\s*°C", temp_line)
+            self.temp_history.append(float(match.group(1)) if match else float("nan"))
         except:
             self.temp_label.setText("Temperature: [Unavailable]")
+            self.temp_history.append(float("nan"))
 
         # Fan
         try:
@@ -204,38 +378,157 @@ class RGBDashboard(QWidget):
             self.fan_label.setText("Fan: [Unavailable]")
 
         # GPU
-        gpu_text = self.get_gpu_info()
-        self.gpu_label.setText(gpu_text)
+        if self.gpu_cards:
+            self.update_gpu_stats()
 
-        try:
-            if "NVIDIA" in gpu_text:
-                usage, mem_used, mem_total = gpu_text.split("|")[1].strip().split(" ")[0], gpu_text.split("/")[0].split()[-1][:-2], gpu_text.split("/")[1].split("M")[0]
-                mem_used = int(mem_used)
-                mem_total = int(mem_total)
-                percent_used = (mem_used / mem_total) * 100
-                self.draw_pie_chart(self.gpu_scene, percent_used, (0, 255, 255), (50, 50, 50))
+    def update_host_stats(self):
+        # CPU
+        total = psutil.cpu_percent()
+        self.cpu_label.setText(f"Total CPU Usage: {total}%")
+
+        per_core = psutil.cpu_percent(percpu=True)
+        self.freq_history.append(self.core_values(self.freq_reader.frequencies(), float("nan")))
+        self.cpu_data.append(per_core)
+        self.update_throttle_counts()
+
+        freqs = self.freq_history.latest()
+        draw = self.pages.currentWidget() is self.cpu_page
+        for i, usage in enumerate(per_core):
+            self.cpu_graphs[i].append(usage, draw)
+            self.freq_graphs[i].append(freqs[i], draw)
+
+        # RAM
+        ram = psutil.virtual_memory()
+        self.ram_label.setText(
+            f"RAM Usage: {ram.used // (1024**2)}MB / {ram.total // (1024**2)}MB ({ram.percent}%)"
+        )
+        self.ram_history.append((ram.percent, ram.used / (1024**2)))
+        self.draw_pie_chart(self.ram_scene, ram.percent, (255, 0, 255), (50, 50, 50))
+
+    def core_values(self, values, pad):
+        # Readers may report fewer cores than psutil; keep one value per core
+        values = list(values[:self.num_cores])
+        return values + [pad] * (self.num_cores - len(values))
+
+    def update_throttle_counts(self):
+        deltas = [0] * self.num_cores
+        if self.freq_reader.has_throttle:
+            counts = self.core_values(self.freq_reader.throttle_counts(), 0)
+            freqs = self.freq_history.latest()
+            tick = self.cpu_data.count
+            for i, (count, last) in enumerate(zip(counts, self.throttle_last)):
+                if count > last:
+                    deltas[i] = count - last
+                    freq = freqs[i] if freqs[i] == freqs[i] else 0.0
+                    self.throttle_marks[i].append((tick, freq, deltas[i]))
+                    self.throttle_active.add(i)
+            self.throttle_last = counts
+        self.throttle_history.append(deltas)
+
+        # Markers sit on the frequency graph's "samples ago" axis, so only
+        # cores with throttle events still in the window need redrawing
+        tick = self.cpu_data.count
+        for i in list(self.throttle_active):
+            marks = self.throttle_marks[i]
+            while marks and tick - marks[0][0] >= self.history_length:
+                marks.popleft()
+            self.throttle_markers[i].setData(
+                x=[t - tick for t, _, _ in marks], y=[f for _, f, _ in marks]
+            )
+            if marks:
+                events = sum(n for _, _, n in marks)
+                self.freq_titles[i].setTitle(f"Core {i} MHz | THROTTLED x{events}", color='orange')
             else:
-                self.draw_pie_chart(self.gpu_scene, 0, (100, 100, 100), (30, 30, 30))
-        except:
-            self.draw_pie_chart(self.gpu_scene, 0, (100, 100, 100), (30, 30, 30))
+                self.freq_titles[i].setTitle(f"Core {i} MHz", color='w')
+                self.throttle_active.discard(i)
 
-    def get_gpu_info(self):
+    def update_cgroup_stats(self):
+        # CPU, as a share of the cgroup's cpu.max allowance
         try:
-            output = subprocess.check_output([
-                "nvidia-smi", "--query-gpu=utilization.gpu,memory.used,memory.total",
-                "--format=csv,noheader,nounits"
-            ], text=True)
-            usage, mem_used, mem_total = output.strip().split(", ")
-            return f"GPU: {usage}% | {mem_used}MB / {mem_total}MB (NVIDIA)"
-        except:
+            total = self.cgroup.cpu_percent()
+            self.cpu_allowance = self.cgroup.allowances[self.cgroup.path]
+            self.cpu_label.setText(f"Container CPU Usage: {total:.1f}% of {self.cpu_allowance:g} CPU")
+            self.cgroup_data.append(total)
+            self.cgroup_graph.append(total)
+        except (OSError, KeyError):
+            self.cpu_label.setText("Container CPU Usage: [Unavailable]")
+            self.cgroup_data.append(float("nan"))
+            self.cgroup_graph.append(float("nan"))
+
+        # RAM, against memory.max
+        try:
+            mem = self.cgroup.memory()
+            self.ram_label.setText(
+                f"Container RAM: {mem['current'] // (1024**2)}MB / {mem['max'] // (1024**2)}MB ({mem['percent']:.1f}%)"
+                f" | anon {mem['anon'] // (1024**2)}MB, file {mem['file'] // (1024**2)}MB"
+            )
+            self.ram_history.append((mem['percent'], mem['current'] / (1024**2)))
+            self.draw_pie_chart(self.ram_scene, mem['percent'], (255, 0, 255), (50, 50, 50))
+        except OSError:
+            self.ram_label.setText("Container RAM: [Unavailable]")
+            self.ram_history.append((float("nan"), float("nan")))
+
+        # Children
+        if self.show_children:
             try:
-                output = subprocess.check_output("glxinfo | grep 'Device'", shell=True, text=True)
-                return "GPU: " + output.strip()
-            except:
-                return "GPU: [Unavailable]"
+                lines = [
+                    f"{path}: CPU {cpu:.1f}% | RAM {mem['current'] // (1024**2)}MB ({mem['percent']:.1f}%)"
+                    for path, cpu, mem in self.cgroup.child_usage()
+                ]
+                self.children_label.setText("\n".join(lines) or "Child cgroups: [None]")
+            except OSError:
+                self.children_label.setText("Child cgroups: [Unavailable]")
+
+    def update_gpu_stats(self):
+        self.gpu_monitor.update()
+        for index, card in self.gpu_cards.items():
+            s = self.gpu_monitor.samples.get(index)
+            fmt = gpu.format_value
+            if s is None:
+                card.setText(f"GPU {index}: [Not Reporting]")
+            else:
+                card.setText(
+                    f"GPU {index}: {s.name}\n"
+                    f"{fmt(s.utilization, '%')} | {fmt(s.memory_used, 'MB')} / {fmt(s.memory_total, 'MB')} | "
+                    f"{fmt(s.temperature, 'C')} | {fmt(s.power_draw, 'W', 1)} / {fmt(s.power_limit, 'W')} | "
+                    f"SM {fmt(s.clock_sm, 'MHz')}, Mem {fmt(s.clock_mem, 'MHz')}"
+                )
+            latest = self.gpu_monitor.history[index].latest()
+            for channel, lod in self.gpu_curves[index]:
+                lod.append(latest[channel])
+
+def positive_int(text):
+    value = int(text)
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {text}")
+    return value
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    window = RGBDashboard()
+    parser = argparse.ArgumentParser(description="Neon RGB System Dashboard")
+    parser.add_argument("--cgroup", nargs="?", const="", default=None,
+                        help="monitor a cgroup v2 instead of the host (default: the current cgroup)")
+    parser.add_argument("--children", action="store_true",
+                        help="in cgroup mode, also list child cgroups with their usage")
+    parser.add_argument("--history", type=positive_int, default=60,
+                        help="samples of history to keep per series (default: 60)")
+    parser.add_argument("--antialias", action="store_true",
+                        help="antialias plot curves (slower on CPU raster rendering)")
+    parser.add_argument("--export", metavar="PATH",
+                        help="write the retained history to PATH on exit (.csv, otherwise columnar .npz)")
+    args, qt_args = parser.parse_known_args()
+    if args.export:
+        # Fail now rather than after the history has been collected
+        export_dir = os.path.dirname(os.path.abspath(args.export))
+        if not os.path.isdir(export_dir) or not os.access(export_dir, os.W_OK):
+            parser.error(f"--export: directory {export_dir} does not exist or is not writable")
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    # Plain raster painting; decimated curves keep it cheap without OpenGL
+    pg.setConfigOptions(antialias=args.antialias, useOpenGL=False)
+    try:
+        window = RGBDashboard(cgroup=args.cgroup, show_children=args.children,
+                              history=args.history, export_path=args.export)
+    except ValueError as e:
+        parser.error(str(e))
     window.show()
     sys.exit(app.exec_())